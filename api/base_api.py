@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
+import re
 from http import HTTPStatus
-from json import JSONDecodeError, loads
 from typing import Any, Dict
 
 import allure
 import curlify
 import requests
 
-from utils.common import set_allure_detail
+from utils.common import parse_json, set_allure_detail
 from utils.enums import LogLevel
 
+json_object_pattern = re.compile(r"\s*\{")
+
 
 class BaseAPI:
     def __init__(self, base_url: str, headers: dict) -> None:
@@ -49,7 +51,8 @@ class BaseAPI:
             files (Any): The files to be included in the request.
 
         Returns:
-            Dict[str, Any]: The response content of the request as a dictionary.
+            Dict[str, Any]: The response content of the request as a dictionary,
+                integers longer than 64 bits are kept exact.
         """
         total_headers = self._headers.copy()
         if headers:
@@ -87,12 +90,15 @@ class BaseAPI:
             status = f"name: {HTTPStatus(r.status_code).name}, code: {r.status_code}"
             set_allure_detail(name="status code", body=status, level=LogLevel.INFO)
 
-            if len(r.text) < 1024 * 256:
-                try:
-                    response_body = loads(r.text)
-                    response_body.update({"status_code": r.status_code})
-                except JSONDecodeError:
-                    response_body = {"status_code": r.status_code, "text": r.text}
+            text = r.text
+            if len(text) < 1024 * 256:
+                response_body = {"status_code": r.status_code, "text": text}
+                if json_object_pattern.match(text):
+                    try:
+                        response_body = parse_json(text)
+                        response_body.update({"status_code": r.status_code})
+                    except ValueError:
+                        pass
             else:
                 response_body = {
                     "status_code": r.status_code,
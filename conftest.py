@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import inspect
-import json
 import logging
 import os
 import re
@@ -9,6 +8,7 @@ import traceback
 
 import allure
 import filelock
+import orjson
 import pytest
 from openpyxl import Workbook, load_workbook
 
@@ -16,6 +16,7 @@ from utils.clickhouse_connection import ClickhouseConnection
 from utils.common import (
     get_code_modifiers,
     get_current_datetime,
+    preload_conf,
     set_allure_detail,
     set_column_max_width,
 )
@@ -68,9 +69,16 @@ def ck():
     ck.close()
 
 
+def pytest_configure(config):
+    # a plain "pytest -n N" shares the log file and remote hosts with the workers as well
+    if config.getoption("numprocesses", None):
+        os.environ["AUTO_API_MULTIPROC"] = "1"
+
+
 def pytest_sessionstart():
     global session_start_time
     session_start_time = time.time()
+    preload_conf()
 
 
 def pytest_runtest_makereport(item, call):
@@ -100,9 +108,9 @@ def pytest_runtest_makereport(item, call):
             break
 
     traceback_error = ("\n".join(error_list[error_idx:])).strip()
-    code_modifiers = json.dumps(
+    code_modifiers = orjson.dumps(
         get_code_modifiers(file_path=file_path, line_number=line_number)
-    )
+    ).decode("utf-8")
 
     with conftest_lock:
         xlsx_path = os.path.abspath(os.path.join(report_sheet_dir, "failed_cases.xlsx"))
@@ -157,7 +165,7 @@ def testcase_information(request):
         else f"{file_name}::{func_name}",
         level=LogLevel.INFO,
     )
-    set_allure_detail(
+    code_modifiers = set_allure_detail(
         name="last modified by",
         body=get_code_modifiers(file_path, line_range),
         level=LogLevel.INFO,
@@ -166,9 +174,7 @@ def testcase_information(request):
     yield
 
     set_allure_detail(name="end time", body=get_current_datetime(), level=LogLevel.INFO)
-    allure.dynamic.title(
-        f"{request.node.name} - {json.dumps(get_code_modifiers(file_path, line_range))}"
-    )
+    allure.dynamic.title(f"{request.node.name} - {code_modifiers}")
 
 
 @pytest.fixture(scope="session", autouse=True)
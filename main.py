@@ -41,7 +41,14 @@ def exe_test(
     pytest.main(args)
 
     if generate_report:
-        command = f"allure generate {report_raw_dir} -o {report_html_dir} --clean"
+        command = [
+            "allure",
+            "generate",
+            report_raw_dir,
+            "-o",
+            report_html_dir,
+            "--clean",
+        ]
         execute_local_command(command)
 
 
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 import base64
+import contextlib
 import datetime
 import os
 import shutil
 import sqlite3
 import sys
 import traceback
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import filelock
@@ -15,6 +17,25 @@ from utils.common import get_env_conf, load_json
 from utils.dirs import lock_dir, tmp_dir
 from utils.logger import logger
 
+COOKIES_SQL = """
+    SELECT
+        host_key,
+        name,
+        encrypted_value,
+        expires_utc,
+        has_expires,
+        last_update_utc
+    FROM
+        cookies;
+"""
+COOKIE_VERSION_SQL = """
+    SELECT
+        value
+    FROM
+        meta
+    WHERE key='version';
+"""
+
 
 class ChromeBrowser:
     def __init__(self, conf_name: str = "chrome_browser") -> None:
@@ -229,35 +250,15 @@ class ChromeBrowser:
         Returns:
             None
         """
-        conn = sqlite3.connect(self._cookies_path)
-        conn.row_factory = ChromeBrowser._dict_factory
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-                SELECT
-                    host_key,
-                    name,
-                    encrypted_value,
-                    expires_utc,
-                    has_expires,
-                    last_update_utc
-                FROM
-                    cookies;
-            """
-        )
-        raw_cookies = cursor.fetchall()
-
-        cursor.execute(
-            """
-                SELECT
-                    value
-                FROM
-                    meta
-                WHERE key='version';
-            """
-        )
-        cookie_version = cursor.fetchone()
+        # close the database before returning, an open handle would block removing the copy on Windows
+        with contextlib.closing(
+            sqlite3.connect(
+                f"{Path(self._cookies_path).as_uri()}?mode=ro&immutable=1", uri=True
+            )
+        ) as conn:
+            conn.row_factory = ChromeBrowser._dict_factory
+            raw_cookies = conn.execute(COOKIES_SQL).fetchall()
+            cookie_version = conn.execute(COOKIE_VERSION_SQL).fetchone()
 
         for cookie in raw_cookies:
             last_update_time = datetime.datetime.fromtimestamp(
@@ -278,8 +279,6 @@ class ChromeBrowser:
                 }
             )
 
-        conn.close()
-
     def _fetch_browser_local_storage_items(self) -> None:
         """
         Fetch browser local storage items and store them in self._local_storage_items
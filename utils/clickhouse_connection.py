@@ -2,16 +2,18 @@
 import os
 import traceback
 from types import TracebackType
-from typing import Any, Dict, List, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
 
 import filelock
 from clickhouse_driver import Client
-from sshtunnel import SSHTunnelForwarder
 
 from utils.common import get_env_conf
 from utils.dirs import lock_dir
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    from sshtunnel import SSHTunnelForwarder
+
 
 class ClickhouseConnection:
     _instance = None
@@ -84,7 +86,7 @@ class ClickhouseConnection:
     @staticmethod
     def _create_clickhouse_connection(
         clickhouse_conf: dict, ssh_conf: dict, use_tunnel: bool
-    ) -> Union[Tuple[None, Client], Tuple[SSHTunnelForwarder, Client]]:
+    ) -> Union[Tuple[None, Client], Tuple["SSHTunnelForwarder", Client]]:
         """
         Create a ClickHouse connection.
 
@@ -98,6 +100,8 @@ class ClickhouseConnection:
             and ClickHouse connection objects if using tunnel, otherwise None and ClickHouse connection object.
         """
         if use_tunnel:
+            from sshtunnel import SSHTunnelForwarder
+
             tunnel_forwarder = SSHTunnelForwarder(
                 ssh_address=(ssh_conf["ssh_host"], ssh_conf["ssh_port"]),
                 ssh_username=ssh_conf["ssh_user"],
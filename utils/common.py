@@ -1,20 +1,28 @@
 # -*- coding: utf-8 -*-
+import copy
 import csv
-import datetime
+import functools
 import json
 import os
 import random
+import re
 import shutil
 import subprocess
-from typing import Any, List, Union
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple, Union
 
 import allure
 import filelock
 import git
+import orjson
 import yaml
 from openpyxl.styles import Alignment
 from openpyxl.worksheet.worksheet import Worksheet
 
+from utils import get_cache, set_cache
 from utils.dirs import (
     config_dir,
     data_dir,
@@ -28,6 +36,86 @@ from utils.enums import LogLevel
 from utils.logger import logger
 
 common_lock = filelock.FileLock(os.path.abspath(os.path.join(lock_dir, f"common.lock")))
+conf_cache = OrderedDict()
+conf_cache_size = 100
+author_mail_pattern = re.compile(rb"^author-mail <([^>]*)>", re.M)
+yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# orjson only handles integers up to 64 bits, longer ones are left to json
+long_number_pattern = re.compile(r"\d{19,}")
+text_attachment_type = allure.attachment_type.TEXT
+json_attachment_type = allure.attachment_type.JSON
+wrap_text_alignment = Alignment(wrapText=True)
+log_methods = {
+    LogLevel.ERROR: logger.error,
+    LogLevel.WARNING: logger.warning,
+    LogLevel.INFO: logger.info,
+    LogLevel.DEBUG: logger.debug,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_conf_path(conf_name: str, decrypted: bool) -> str:
+    """
+    Get the path of a configuration file under the config directory.
+
+    Args:
+        conf_name (str): File name of the configuration.
+        decrypted (bool): Whether to use the decrypted copy of the configuration.
+
+    Returns:
+        str: The path of the configuration file.
+    """
+    conf_path = os.path.abspath(os.path.join(config_dir, conf_name))
+
+    return f"{conf_path}.decrypted" if decrypted else conf_path
+
+
+def _load_conf(conf_path: str) -> dict:
+    """
+    Load a YAML configuration file, reusing the parsed result while the file is unchanged.
+
+    Args:
+        conf_path (str): Path of the configuration file.
+
+    Returns:
+        dict: The parsed configuration, cached by path in a bounded LRU and invalidated on mtime or size change.
+    """
+    stat = os.stat(conf_path)
+    cached = conf_cache.get(conf_path)
+    if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+        conf_cache.move_to_end(conf_path)
+        return cached[-1]
+
+    with open(conf_path, "rb") as f:
+        conf = yaml.load(f.read(), Loader=yaml_loader)
+
+    conf_cache[conf_path] = (stat.st_mtime, stat.st_size, conf)
+    conf_cache.move_to_end(conf_path)
+    while len(conf_cache) > conf_cache_size:
+        conf_cache.popitem(last=False)
+
+    return conf
+
+
+def preload_conf() -> None:
+    """
+    Load the environment and extension configurations concurrently into the configuration cache.
+
+    Returns:
+        None
+    """
+    decrypted = bool(os.environ.get("KEY"))
+    conf_paths = [
+        conf_path
+        for conf_path in (
+            _get_conf_path(f"""conf_{os.environ.get("ENV", "test")}.yaml""", decrypted),
+            _get_conf_path("conf_ext.yaml", decrypted),
+        )
+        if os.path.exists(conf_path)
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(conf_paths) or 1) as executor:
+        list(executor.map(_load_conf, conf_paths))
 
 
 def get_env_conf(name: str = None) -> Union[dict, str, list]:
@@ -40,18 +128,14 @@ def get_env_conf(name: str = None) -> Union[dict, str, list]:
     Returns:
         Union[dict, str, list]: Configuration item if name is provided, otherwise the entire configuration.
     """
-    conf_path = os.path.abspath(
-        os.path.join(config_dir, f"""conf_{os.environ.get("ENV", "test")}.yaml""")
+    conf = _load_conf(
+        _get_conf_path(
+            f"""conf_{os.environ.get("ENV", "test")}.yaml""",
+            bool(os.environ.get("KEY")),
+        )
     )
 
-    with open(
-        conf_path if not os.environ.get("KEY") else f"{conf_path}.decrypted",
-        "r",
-        encoding="utf-8",
-    ) as f:
-        conf = yaml.safe_load(f)
-
-    return conf.get(name) if name else conf
+    return copy.deepcopy(conf.get(name) if name else conf)
 
 
 def get_ext_conf(name: str = None) -> Union[dict, str, list]:
@@ -64,16 +148,9 @@ def get_ext_conf(name: str = None) -> Union[dict, str, list]:
     Returns:
         Union[dict, str, list]: Configuration item if name is provided, otherwise the entire configuration.
     """
-    conf_path = os.path.abspath(os.path.join(config_dir, f"conf_ext.yaml"))
-
-    with open(
-        conf_path if not os.environ.get("KEY") else f"{conf_path}.decrypted",
-        "r",
-        encoding="utf-8",
-    ) as f:
-        conf = yaml.safe_load(f)
+    conf = _load_conf(_get_conf_path("conf_ext.yaml", bool(os.environ.get("KEY"))))
 
-    return conf.get(name) if name else conf
+    return copy.deepcopy(conf.get(name) if name else conf)
 
 
 def get_current_datetime() -> str:
@@ -83,7 +160,44 @@ def get_current_datetime() -> str:
     Returns:
         str: The string representation of the current time, formatted as "%Y%m%d_%H%M%S".
     """
-    return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return time.strftime("%Y%m%d_%H%M%S")
+
+
+def parse_json(text: str) -> Any:
+    """
+    Parse a json document, keeping integers longer than 64 bits exact.
+
+    Args:
+        text (str): The json document.
+
+    Returns:
+        Any: The parsed json data.
+    """
+    if long_number_pattern.search(text):
+        return json.loads(text)
+    return orjson.loads(text)
+
+
+def serialize_json(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to json, including non-str dict keys and integers longer than 64 bits.
+
+    Args:
+        data (Any): The data to be serialized.
+        indent (bool): Whether to indent the output for readability. Defaults to False (compact).
+
+    Returns:
+        bytes: The utf-8 encoded json document.
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(data, option=option)
+    except TypeError:
+        return json.dumps(
+            data, ensure_ascii=False, indent=2 if indent else None
+        ).encode("utf-8")
 
 
 def load_json(json_path: str) -> Any:
@@ -99,25 +213,28 @@ def load_json(json_path: str) -> Any:
     logger.info(f"load json file: {json_path}")
 
     with open(json_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+        return parse_json(f.read())
 
 
-def dump_json(json_path: str, data: Any) -> None:
+def dump_json(json_path: str, data: Any, indent: bool = False) -> None:
     """
     Dump json to a file.
 
     Args:
         json_path (str): The path to the json file.
         data (Any): The json data to be dumped.
+        indent (bool): Whether to indent the output for readability. Defaults to False (compact).
 
     Returns:
         None
     """
     logger.info(f"dump json file: {json_path}")
 
+    payload = serialize_json(data, indent=indent)
+
     with common_lock:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        with open(json_path, "wb") as f:
+            f.write(payload)
 
 
 def set_allure_detail(
@@ -132,28 +249,55 @@ def set_allure_detail(
         level (LogLevel): Log level for the attachment. Defaults to LogLevel.ERROR.
 
     Returns:
-        None
+        str: The attached body, serialized to a JSON string if it is not a string.
     """
     if isinstance(body, str):
-        attachment_type = allure.attachment_type.TEXT
+        attachment_type = text_attachment_type
     else:
-        body = json.dumps(body)
-        attachment_type = allure.attachment_type.JSON
+        body = serialize_json(body).decode("utf-8")
+        attachment_type = json_attachment_type
 
     allure.attach(body=body, name=name, attachment_type=attachment_type)
 
-    if level == LogLevel.ERROR:
-        logger.error(f"{name}: {body}")
-    elif level == LogLevel.WARNING:
-        logger.warning(f"{name}: {body}")
-    elif level == LogLevel.INFO:
-        logger.info(f"{name}: {body}")
-    else:
-        logger.debug(f"{name}: {body}")
+    log_methods.get(level, logger.debug)(f"{name}: {body}")
 
     return body
 
 
+@functools.lru_cache(maxsize=4096)
+def _blame_modifiers(
+    file_path: str, start_line: int, end_line: int, head_sha: str
+) -> Tuple[str, ...]:
+    """
+    Get the email addresses of the code modifiers of a line range by git blame.
+
+    Args:
+        file_path (str): File path.
+        start_line (int): Start line of the range.
+        end_line (int): End line of the range.
+        head_sha (str): The HEAD commit of the repository, part of the cache key.
+
+    Returns:
+        Tuple[str, ...]: Email addresses of the code modifiers, in order of first appearance.
+    """
+    blame_output = get_cache("git_repo").git.blame(
+        "--line-porcelain",
+        "-L",
+        f"{start_line},{end_line}",
+        "--",
+        file_path,
+        with_exceptions=False,
+        stdout_as_string=False,
+    )
+
+    return tuple(
+        dict.fromkeys(
+            author_mail.decode("utf-8")
+            for author_mail in author_mail_pattern.findall(blame_output)
+        )
+    )
+
+
 def get_code_modifiers(
     file_path: str, line_range: dict = None, line_number: int = None
 ) -> List[str]:
@@ -171,45 +315,52 @@ def get_code_modifiers(
     if not line_range and not line_number:
         raise Exception("miss argument: line_range or line_number")
 
-    modifiers = set()
+    if line_number:
+        start_line = line_number
+        end_line = line_number
+    else:
+        start_line = line_range.get("start_line")
+        end_line = line_range.get("end_line")
+
+    modifiers = []
 
     try:
-        repo = git.Repo(project_dir)
+        repo = get_cache("git_repo")
+        if repo is None:
+            repo = git.Repo(project_dir, odbt=git.GitCmdObjectDB)
+            set_cache("git_head", repo.head.commit.hexsha)
+            set_cache("git_repo", repo)
     except Exception as e:
         logger.warning(f"git.not.found: {e}")
-        modifiers.add("git.not.found")
+        modifiers.append("git.not.found")
     else:
-        commit_blames = repo.blame(file=file_path, rev=None)
-        row_blames = []
-        for commit_blame in commit_blames:
-            rows = commit_blame[-1]
-            git_commit = commit_blame[0]
-            for row in rows:
-                row_blames.append(
-                    {
-                        "code": row,
-                        "date": git_commit.committed_datetime.strftime(
-                            "%Y-%m-%d %H:%M:%S"
-                        )
-                        if bool(int(git_commit.hexsha, 16))
-                        else "not.committed.yet",
-                        "author": git_commit.author.email
-                        if bool(int(git_commit.hexsha, 16))
-                        else "not.committed.yet",
-                    }
-                )
-
-        if line_number:
-            start_line = line_number
-            end_line = line_number
-        else:
-            start_line = line_range.get("start_line")
-            end_line = line_range.get("end_line")
-
-        for idx in range(start_line, end_line + 1):
-            modifiers.add(row_blames[idx]["author"])
+        modifiers.extend(
+            _blame_modifiers(file_path, start_line, end_line, get_cache("git_head"))
+        )
     finally:
-        return list(modifiers)
+        return modifiers
+
+
+def get_csv_rows(csv_path: str) -> Iterator[List[str]]:
+    """
+    Iterate over the rows of a CSV file without loading the whole file.
+
+    Args:
+        csv_path (str): Path of the CSV file.
+
+    Returns:
+        Iterator[List[str]]: Rows in the CSV file, where each row is a list of strings.
+    """
+    csv_path = os.path.join(data_dir, csv_path)
+
+    if not os.path.exists(csv_path):
+        logger.error(f"file not found: {csv_path}")
+        return
+
+    logger.info(f"get csv data: {csv_path}")
+
+    with open(csv_path, "r", encoding="utf-8", newline="", buffering=1 << 16) as f:
+        yield from csv.reader(f)
 
 
 def get_csv_data(csv_path: str) -> List[List[str]]:
@@ -222,21 +373,64 @@ def get_csv_data(csv_path: str) -> List[List[str]]:
     Returns:
         List[List[str]]: List of rows in the CSV file, where each row is a list of strings.
     """
-    res = []
-    csv_path = os.path.abspath(os.path.join(data_dir, csv_path))
+    return list(get_csv_rows(csv_path))
+
+
+def get_csv_table(csv_path: str) -> Any:
+    """
+    Get the data from a CSV file as a columnar pyarrow table, for large data files.
+
+    Args:
+        csv_path (str): Path of the CSV file.
+
+    Returns:
+        Any: A pyarrow.Table with auto-generated column names (f0, f1, ...), or None if the file is not found.
+    """
+    csv_path = os.path.join(data_dir, csv_path)
 
     if not os.path.exists(csv_path):
         logger.error(f"file not found: {csv_path}")
-        return res
+        return None
 
-    logger.info(f"get csv data: {csv_path}")
+    logger.info(f"get csv table: {csv_path}")
 
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        for _, row in enumerate(reader):
-            res.append(row)
+    from pyarrow import csv as pa_csv  # pip install pyarrow==14.0.2
 
-    return res
+    return pa_csv.read_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(
+            block_size=4 << 20, autogenerate_column_names=True
+        ),
+    )
+
+
+def get_csv_batches(csv_path: str) -> Iterator[Any]:
+    """
+    Iterate over a large CSV file in pyarrow record batches, keeping memory bounded by the block size.
+
+    Args:
+        csv_path (str): Path of the CSV file.
+
+    Returns:
+        Iterator[Any]: pyarrow.RecordBatch objects with auto-generated column names (f0, f1, ...).
+    """
+    csv_path = os.path.join(data_dir, csv_path)
+
+    if not os.path.exists(csv_path):
+        logger.error(f"file not found: {csv_path}")
+        return
+
+    logger.info(f"get csv batches: {csv_path}")
+
+    from pyarrow import csv as pa_csv  # pip install pyarrow==14.0.2
+
+    with pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(
+            block_size=4 << 20, autogenerate_column_names=True
+        ),
+    ) as reader:
+        yield from reader
 
 
 def get_json_data(json_path: str) -> Union[dict, list]:
@@ -250,7 +444,7 @@ def get_json_data(json_path: str) -> Union[dict, list]:
        Union[dict, list]: The data from the json file, which can be a dict or a list of dict.
     """
     res = {}
-    json_path = os.path.abspath(os.path.join(data_dir, json_path))
+    json_path = os.path.join(data_dir, json_path)
 
     if not os.path.exists(json_path):
         logger.error(f"file not found: {json_path}")
@@ -274,13 +468,18 @@ def clean_logs_and_reports() -> None:
         shutil.rmtree(report_dir)
 
         os.makedirs(report_dir, exist_ok=True)
-        open(os.path.abspath(os.path.join(report_dir, ".gitkeep")), "w").close()
+        Path(report_dir, ".gitkeep").touch()
 
-    if os.path.exists(log_request_dir):
-        shutil.rmtree(log_request_dir)
+    for log_sub_dir in (log_request_dir, log_summary_dir):
+        if not os.path.exists(log_sub_dir):
+            continue
 
-    if os.path.exists(log_summary_dir):
-        shutil.rmtree(log_summary_dir)
+        with os.scandir(log_sub_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
 
 
 def generate_random_string(num: int, charset: str) -> str:
@@ -299,7 +498,7 @@ def generate_random_string(num: int, charset: str) -> str:
     Returns:
         str: The generated random string.
     """
-    return "".join(random.choice(charset) for _ in range(num))
+    return "".join(random.choices(charset, k=num))
 
 
 def set_column_max_width(worksheet: Worksheet) -> None:
@@ -313,47 +512,128 @@ def set_column_max_width(worksheet: Worksheet) -> None:
         None
     """
     for column_cells in worksheet.columns:
-        max_length = 0
-        column = column_cells[0].column_letter
         for cell in column_cells:
-            cell.alignment = Alignment(wrapText=True)
-
-            text = str(cell.value)
-            length = len(text[: text.find("\n")])
+            cell.alignment = wrap_text_alignment
 
-            if length > max_length:
-                max_length = length
+        # the width follows the first line of each cell, as the rest is wrapped
+        max_length = max(
+            (
+                len(str(cell.value).partition("\n")[0])
+                for cell in column_cells
+                if cell.value is not None
+            ),
+            default=0,
+        )
 
-        worksheet.column_dimensions[column].width = max_length + 10
+        worksheet.column_dimensions[column_cells[0].column_letter].width = (
+            max_length + 10
+        )
 
 
-def execute_local_command(cmd: str, inp: str = None) -> str:
+def execute_local_command(cmd: Union[str, List[str]], inp: str = None) -> str:
     """
     Execute a local command and optionally provide input to it.
 
     Args:
-        cmd (str): The command to be executed.
+        cmd (Union[str, List[str]]): The command to be executed, a shell command string or an argv list executed without a shell.
         inp (str): The input to be provided to the command. Defaults to None.
 
     Returns:
         str: The stdout output of the command.
 
     """
-    proc = subprocess.Popen(
-        cmd,
-        shell=True,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        universal_newlines=True,
-    )
-    stdout, stderr = proc.communicate(input=f"{inp}\n") if inp else proc.communicate()
-    return_code = proc.returncode
+    cmd_line = cmd if isinstance(cmd, str) else " ".join(cmd)
 
-    if return_code == 0:
-        logger.info(f"execute command success: {cmd}")
+    try:
+        # an empty input still gives the command a closed stdin instead of the terminal
+        proc = subprocess.run(
+            cmd,
+            shell=isinstance(cmd, str),
+            input=f"{inp}\n" if inp else "",
+            capture_output=True,
+            text=True,
+        )
+    except OSError as e:
+        logger.warning(f"execute command failed: {cmd_line}")
+        logger.error(f"error:\n{e}")
+        return ""
+
+    if proc.returncode == 0:
+        logger.info(f"execute command success: {cmd_line}")
     else:
-        logger.warning(f"execute command failed: {cmd}")
-        logger.error(f"stderr:\n{stderr}")
+        logger.warning(f"execute command failed: {cmd_line}")
+        logger.error(f"stderr:\n{proc.stderr}")
+
+    return proc.stdout
+
+
+@functools.lru_cache(maxsize=8)
+def _load_private_key(key_path: str, mtime: float) -> Any:
+    """
+    Load and parse an RSA private key file, cached until the file is modified.
+
+    Args:
+        key_path (str): The path to the private key file.
+        mtime (float): The modification time of the file, used as part of the cache key.
+
+    Returns:
+        paramiko.RSAKey: The parsed private key.
+    """
+    import paramiko
+
+    return paramiko.RSAKey.from_private_key_file(key_path)
+
+
+def get_private_key(key_path: str = None) -> Any:
+    """
+    Get the parsed RSA private key, so reconnections do not read and parse the key file again.
+
+    Args:
+        key_path (str): The path to the private key file. Defaults to None.
+
+    Returns:
+        paramiko.RSAKey: The parsed private key, or None if no key path is given.
+    """
+    if key_path is None:
+        return None
+
+    return _load_private_key(key_path, os.path.getmtime(key_path))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_service_account_credentials(cred_path: str, mtime: float) -> Any:
+    """
+    Load and parse the service account credentials file, cached until the file is modified.
+
+    Args:
+        cred_path (str): The path to the service account credentials file.
+        mtime (float): The modification time of the file, used as part of the cache key.
+
+    Returns:
+        service_account.Credentials: The unscoped service account credentials.
+    """
+    from google.oauth2 import service_account
+
+    return service_account.Credentials.from_service_account_file(filename=cred_path)
+
+
+def get_service_account_credentials(scopes: List[str]) -> Any:
+    """
+    Get the service account credentials with the given scopes, the private key is parsed once for all Google clients.
+
+    Args:
+        scopes (List[str]): The scopes of the credentials.
+
+    Returns:
+        service_account.Credentials: The scoped service account credentials.
+    """
+    cred_path = os.path.abspath(os.path.join(config_dir, "cred_service_account.json"))
+    if os.environ.get("KEY"):
+        cred_path = f"{cred_path}.decrypted"
+
+    credentials = _load_service_account_credentials(
+        cred_path, os.path.getmtime(cred_path)
+    )
 
-    return stdout
+    # scoped copies share the signer, so the key is not parsed again
+    return credentials.with_scopes(scopes)
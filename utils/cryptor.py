@@ -3,10 +3,12 @@ import binascii
 import os
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
-from Crypto.Util.Padding import pad, unpad
+from Crypto.Util.Padding import unpad
 
 project_dir = os.path.dirname(os.path.dirname(__file__))
 sys.path.append(project_dir)
@@ -24,15 +26,21 @@ def encrypt_file(plaintext_file_path: str, encrypted_file_path: str, key: str) -
     Returns:
         None
     """
+    plaintext_size = os.path.getsize(plaintext_file_path)
+    padding_size = AES.block_size - plaintext_size % AES.block_size
+
+    # read into a buffer with room for the PKCS#7 padding, then encrypt it in place
+    buffer = bytearray(plaintext_size + padding_size)
     with open(plaintext_file_path, "rb") as plaintext_f:
-        plaintext = plaintext_f.read()
+        plaintext_f.readinto(buffer)
+    buffer[plaintext_size:] = bytes([padding_size]) * padding_size
 
     cipher = AES.new(binascii.unhexlify(key.encode("utf-8")), AES.MODE_CBC)
-    ciphertext = cipher.encrypt(pad(plaintext, AES.block_size))
+    cipher.encrypt(buffer, output=buffer)
 
     with open(encrypted_file_path, "wb") as encrypted_f:
         encrypted_f.write(cipher.iv)
-        encrypted_f.write(ciphertext)
+        encrypted_f.write(buffer)
 
 
 def decrypt_file(encrypted_file_path: str, decrypted_file_path: str, key: str) -> None:
@@ -47,15 +55,44 @@ def decrypt_file(encrypted_file_path: str, decrypted_file_path: str, key: str) -
     Returns:
         None
     """
+    buffer = bytearray(os.path.getsize(encrypted_file_path) - AES.block_size)
     with open(encrypted_file_path, "rb") as encrypted_f:
-        iv = encrypted_f.read(16)
-        ciphertext = encrypted_f.read()
+        iv = encrypted_f.read(AES.block_size)
+        encrypted_f.readinto(buffer)
 
     cipher = AES.new(binascii.unhexlify(key.encode("utf-8")), AES.MODE_CBC, iv)
-    plaintext = unpad(cipher.decrypt(ciphertext), AES.block_size)
+    cipher.decrypt(buffer, output=buffer)
+
+    # only the last block carries the padding, validate and strip it without copying the rest
+    last_block = bytes(buffer[-AES.block_size :])
+    padding_size = AES.block_size - len(unpad(last_block, AES.block_size))
 
     with open(decrypted_file_path, "wb") as decrypted_f:
-        decrypted_f.write(plaintext)
+        decrypted_f.write(memoryview(buffer)[: len(buffer) - padding_size])
+
+
+def _find_files(dir_path: str, suffixes: Tuple[str, ...]) -> List[str]:
+    """
+    Find files with the given suffixes under a directory recursively.
+
+    Args:
+        dir_path (str): The directory to search.
+        suffixes (Tuple[str, ...]): The file name suffixes to match.
+
+    Returns:
+        List[str]: Paths of the matched files.
+    """
+    file_paths = []
+    dir_paths = [dir_path]
+    while dir_paths:
+        with os.scandir(dir_paths.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dir_paths.append(entry.path)
+                elif entry.name.endswith(suffixes):
+                    file_paths.append(entry.path)
+
+    return file_paths
 
 
 def encrypt_config() -> None:
@@ -68,7 +105,7 @@ def encrypt_config() -> None:
     """
     from utils.dirs import config_dir, tmp_dir
     from utils.logger import logger
-    
+
     os.makedirs(tmp_dir, exist_ok=True)
 
     key_path = os.path.abspath(os.path.join(tmp_dir, "key"))
@@ -82,15 +119,19 @@ def encrypt_config() -> None:
             key_str = f.read()
         logger.info(f"key path: {key_path}")
 
-    for root, dirs, files in os.walk(config_dir):
-        for file in files:
-            if file.endswith(".yaml") or file.endswith(".json"):
-                file_path = os.path.abspath(os.path.join(root, file))
-                encrypt_file(
+    file_paths = _find_files(config_dir, (".yaml", ".json"))
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(
+            executor.map(
+                lambda file_path: encrypt_file(
                     plaintext_file_path=file_path,
                     encrypted_file_path=file_path + ".encrypted",
                     key=key_str,
-                )
+                ),
+                file_paths,
+            )
+        )
 
 
 def decrypt_config() -> None:
@@ -103,21 +144,24 @@ def decrypt_config() -> None:
     """
     from utils.dirs import config_dir
     from utils.logger import logger
-    
+
     logger.info("using key to decrypt config files")
     key_str = os.environ.get("KEY")
 
-    for root, dirs, files in os.walk(config_dir):
-        for file in files:
-            if file.endswith(".encrypted"):
-                encrypted_file_path = os.path.abspath(os.path.join(root, file))
-                filename_idx = encrypted_file_path.rfind(".")
-                raw_file_path = encrypted_file_path[:filename_idx]
-                decrypt_file(
+    encrypted_file_paths = _find_files(config_dir, (".encrypted",))
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(
+            executor.map(
+                lambda encrypted_file_path: decrypt_file(
                     encrypted_file_path=encrypted_file_path,
-                    decrypted_file_path=raw_file_path + ".decrypted",
+                    decrypted_file_path=os.path.splitext(encrypted_file_path)[0]
+                    + ".decrypted",
                     key=key_str,
-                )
+                ),
+                encrypted_file_paths,
+            )
+        )
 
 
 if __name__ == "__main__":
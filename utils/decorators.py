@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
-import inspect
+import contextlib
 import os
+import sys
+import threading
 from datetime import datetime
 from typing import Callable
 
@@ -10,7 +12,25 @@ import pytz
 from utils.dirs import lock_dir
 
 LOCK_PATH = os.path.abspath(os.path.join(lock_dir, "log.lock"))
-TIME_ZONE = "Asia/Shanghai"
+TIME_ZONE = pytz.timezone("Asia/Shanghai")
+LOG_THREAD_LOCK = threading.RLock()
+LOG_FILE_LOCK = filelock.FileLock(LOCK_PATH)
+NULL_LOCK = contextlib.nullcontext()
+
+
+def is_multiprocess() -> bool:
+    """
+    Check whether the test run is split across processes sharing the log file and remote hosts.
+
+    Workers are recognized by PYTEST_XDIST_WORKER, the controlling process by AUTO_API_MULTIPROC,
+    which main.py and the pytest_configure hook set whenever -n is given.
+
+    Returns:
+        bool: True if running as or alongside pytest-xdist workers, False otherwise.
+    """
+    return bool(
+        os.environ.get("PYTEST_XDIST_WORKER") or os.environ.get("AUTO_API_MULTIPROC")
+    )
 
 
 def log_locker(func: Callable) -> Callable:
@@ -25,13 +45,13 @@ def log_locker(func: Callable) -> Callable:
     """
 
     def wrapper(*args, **kwargs):
-        file_path, line_number = inspect.getframeinfo(inspect.currentframe().f_back)[:2]
+        frame = sys._getframe(1)
         extra = {
-            "time": datetime.now(pytz.timezone(TIME_ZONE)),
-            "file": os.path.basename(file_path),
-            "line": line_number,
+            "time": datetime.now(TIME_ZONE),
+            "file": os.path.basename(frame.f_code.co_filename),
+            "line": frame.f_lineno,
         }
-        with filelock.FileLock(LOCK_PATH):
+        with LOG_THREAD_LOCK, LOG_FILE_LOCK if is_multiprocess() else NULL_LOCK:
             return func(*args, **kwargs, extra=extra)
 
     return wrapper
@@ -1,32 +1,48 @@
 # -*- coding: utf-8 -*-
+import atexit
 import os
+import socket
+import threading
 import traceback
 from types import TracebackType
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
 import filelock
-import paramiko
-from paramiko.channel import ChannelFile, ChannelStderrFile, ChannelStdinFile
-from sshtunnel import SSHTunnelForwarder
 
-from utils.common import get_env_conf
+from utils.common import get_env_conf, get_private_key
+from utils.decorators import NULL_LOCK, is_multiprocess
 from utils.dirs import lock_dir
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    import paramiko
+    from paramiko.channel import ChannelFile, ChannelStderrFile, ChannelStdinFile
+    from sshtunnel import SSHTunnelForwarder
+
 
 class DriverShell:
-    _instance = None
+    _instances = {}
+    _instance_lock = threading.Lock()
 
-    def __new__(cls, *args, **kwargs) -> None:
+    def __new__(
+        cls, ip_conf_name: str = "driver_ip", ssh_conf_name: str = "ssh"
+    ) -> None:
         """
-        Implement singleton mode.
+        Implement singleton mode, one instance per configuration.
+
+        Args:
+            ip_conf_name (str): The name of the IP configuration. Defaults to "driver_ip".
+            ssh_conf_name (str): The name of the SSH configuration. Defaults to "ssh".
 
         Returns:
             None
         """
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        key = (ip_conf_name, ssh_conf_name)
+        if key not in cls._instances:
+            with cls._instance_lock:
+                if key not in cls._instances:
+                    cls._instances[key] = super().__new__(cls)
+        return cls._instances[key]
 
     def __init__(
         self, ip_conf_name: str = "driver_ip", ssh_conf_name: str = "ssh"
@@ -41,13 +57,20 @@ class DriverShell:
         Returns:
             None
         """
-        self._lock = filelock.FileLock(
-            os.path.abspath(os.path.join(lock_dir, f"{ip_conf_name}.lock"))
-        )
-        self._ip = get_env_conf(name=ip_conf_name)
-        self._ssh_conf = get_env_conf(name=ssh_conf_name)
-        self._driver_client = None
-        self._tunnel_forwarder = None
+        with self._instance_lock:
+            if getattr(self, "_initialized", False):
+                return
+
+            self._thread_lock = threading.Lock()
+            self._file_lock = filelock.FileLock(
+                os.path.abspath(os.path.join(lock_dir, f"{ip_conf_name}.lock"))
+            )
+            self._ip = get_env_conf(name=ip_conf_name)
+            self._ssh_conf = get_env_conf(name=ssh_conf_name)
+            self._driver_client = None
+            self._tunnel_forwarder = None
+            atexit.register(self.close)
+            self._initialized = True
 
     def __enter__(self) -> "DriverShell":
         """
@@ -80,7 +103,7 @@ class DriverShell:
     @staticmethod
     def _create_driver_client(
         ssh_conf: dict, ip: str
-    ) -> Tuple[SSHTunnelForwarder, paramiko.SSHClient]:
+    ) -> Tuple["SSHTunnelForwarder", "paramiko.SSHClient"]:
         """
         Create a driver client connection.
 
@@ -91,15 +114,13 @@ class DriverShell:
         Returns:
             Tuple[SSHTunnelForwarder, paramiko.SSHClient]: A tuple containing the SSH tunnel and driver client objects.
         """
+        import paramiko
+        from sshtunnel import SSHTunnelForwarder
+
         driver_client = paramiko.SSHClient()
         driver_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         driver_client.load_system_host_keys()
-        ssh_key = ssh_conf.get("ssh_key")
-
-        if ssh_key is None:
-            private_key = None
-        else:
-            private_key = paramiko.RSAKey.from_private_key_file(ssh_conf.get("ssh_key"))
+        private_key = get_private_key(ssh_conf.get("ssh_key"))
 
         tunnel_forwarder = SSHTunnelForwarder(
             (ssh_conf["ssh_host"], ssh_conf["ssh_port"]),
@@ -116,12 +137,32 @@ class DriverShell:
             pkey=private_key,
             password=ssh_conf.get("ssh_password"),
         )
+        # keep the idle session from being dropped by NAT or firewalls between commands
+        driver_client.get_transport().set_keepalive(30)
 
         return tunnel_forwarder, driver_client
 
+    def _is_connected(self) -> bool:
+        """
+        Check whether the tunnel and the driver client transport are still alive.
+
+        Returns:
+            bool: True if the existing connection can be reused, False otherwise.
+        """
+        if self._tunnel_forwarder is None or self._driver_client is None:
+            return False
+
+        transport = self._driver_client.get_transport()
+
+        return (
+            self._tunnel_forwarder.is_active
+            and transport is not None
+            and transport.is_active()
+        )
+
     def _execute(
         self, command: str
-    ) -> Tuple[ChannelStdinFile, ChannelFile, ChannelStderrFile]:
+    ) -> Tuple["ChannelStdinFile", "ChannelFile", "ChannelStderrFile"]:
         """
         Execute a command on the driver client.
 
@@ -132,7 +173,7 @@ class DriverShell:
             Tuple[ChannelStdinFile, ChannelFile, ChannelStderrFile]: A tuple contained the input, output, and error.
         """
         try:
-            if self._tunnel_forwarder is None or self._driver_client is None:
+            if not self._is_connected():
                 self.close()
                 (
                     self._tunnel_forwarder,
@@ -145,25 +186,39 @@ class DriverShell:
             stdin, stdout, stderr = self._driver_client.exec_command(command)
             return stdin, stdout, stderr
 
-    def execute_command(self, command: str) -> ChannelStdinFile:
+    def execute_command(self, command: str, timeout: float = 600) -> "ChannelStdinFile":
         """
         Execute a command and log the output.
 
         Args:
             command (str): The command to execute.
+            timeout (float): Seconds without output before a hung command is abandoned. Defaults to 600.
 
         Returns:
-            ChannelStdinFile: The input channel of the driver client.
+            ChannelStdinFile: The input channel of this command, commands share the transport but not channels.
         """
-        with self._lock:
+        # the file lock is only needed when other processes drive the same host
+        with self._thread_lock, self._file_lock if is_multiprocess() else NULL_LOCK:
             stdin, stdout, stderr = self._execute(command)
             logger.info(f"executed command: {command}")
-            output = stdout.read().decode("utf-8").strip()
-            error = stderr.read().decode("utf-8").strip()
-            if output:
-                logger.info(f"""standard output: {output}""")
-            if error:
-                logger.error(f"""standard error: {error}""")
+            stdout.channel.settimeout(timeout)
+            try:
+                # log the output as it arrives instead of holding all of it in memory
+                for line in iter(stdout.readline, ""):
+                    line = line.rstrip()
+                    if line:
+                        logger.info(f"""standard output: {line}""")
+                error = stderr.read().decode("utf-8").strip()
+                if error:
+                    logger.error(f"""standard error: {error}""")
+            except socket.timeout:
+                logger.error(
+                    f"command timed out after {timeout}s without output: {command}"
+                )
+            finally:
+                # release the output buffers, the channel stays open for the returned stdin
+                stdout.close()
+                stderr.close()
             return stdin
 
     def close(self) -> None:
@@ -175,5 +230,7 @@ class DriverShell:
         """
         if self._driver_client:
             self._driver_client.close()
+            self._driver_client = None
         if self._tunnel_forwarder:
             self._tunnel_forwarder.close()
+            self._tunnel_forwarder = None
@@ -1,19 +1,58 @@
 # -*- coding: utf-8 -*-
+import atexit
+import io
 import os
 import smtplib
-import time
+import threading
 import traceback
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import BinaryIO, Iterator
 
 from utils.common import get_ext_conf
 from utils.dirs import log_dir, log_summary_dir, report_dir
 from utils.logger import logger
 
+# already compressed formats gain nothing from deflate, they are stored as they are
+incompressible_suffixes = (
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".gz",
+    ".zip",
+    ".zst",
+    ".xz",
+    ".mp4",
+    ".woff2",
+)
+
 
 class EmailNotification:
+    _instances = {}
+    _instance_lock = threading.Lock()
+
+    def __new__(cls, conf_name: str = "email") -> None:
+        """
+        Implement singleton mode, one instance per configuration.
+
+        Args:
+            conf_name (str): The name of the configuration. Defaults to "email".
+
+        Returns:
+            None
+        """
+        if conf_name not in cls._instances:
+            with cls._instance_lock:
+                if conf_name not in cls._instances:
+                    cls._instances[conf_name] = super().__new__(cls)
+        return cls._instances[conf_name]
+
     def __init__(self, conf_name: str = "email") -> None:
         """
         Initialize an instance of the EmailNotification class.
@@ -24,64 +63,172 @@ class EmailNotification:
         Returns:
             None
         """
-        self._conf = get_ext_conf(name=conf_name)
-        self._sender = self._conf.get("sender")
-        self._password = self._conf.get("password")
-        self._server = self._conf.get("server")
-        self._recipients = self._conf.get("recipients")
+        with self._instance_lock:
+            if getattr(self, "_initialized", False):
+                return
+
+            self._conf = get_ext_conf(name=conf_name)
+            self._sender, self._password, self._server, self._recipients = (
+                self._conf.get(key)
+                for key in ("sender", "password", "server", "recipients")
+            )
+            self._max_messages_per_session = self._conf.get(
+                "max_messages_per_session", 100
+            )
+            self._smtp = None
+            self._sent_count = 0
+            self._smtp_lock = threading.Lock()
+            self._archives = {}
+            atexit.register(self.close)
+            self._initialized = True
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """
+        Get the logged in SMTP session, reconnecting if the server has dropped it.
+
+        Returns:
+            smtplib.SMTP: The SMTP session.
+        """
+        # start a new session now and then, servers cap the messages sent per session
+        if self._sent_count >= self._max_messages_per_session:
+            self.close()
+
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except smtplib.SMTPServerDisconnected:
+                pass
+            self._smtp = None
+
+        smtp = smtplib.SMTP(self._server, 587)
+        try:
+            smtp.starttls()
+            smtp.login(self._sender, self._password)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self._sent_count = 0
+
+        return smtp
+
+    def close(self) -> None:
+        """
+        Quit the SMTP session.
+
+        Returns:
+            None
+        """
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPServerDisconnected:
+                pass
+            self._smtp = None
 
     @staticmethod
-    def _zip_file(target_dir: str, zip_path: str) -> None:
+    def _scan_files(target_dir: str) -> Iterator[os.DirEntry]:
         """
-        Compresses a directory into a zip file.
+        Iterate over the files to be archived under a directory recursively.
+
+        Args:
+            target_dir (str): The directory to scan.
+
+        Returns:
+            Iterator[os.DirEntry]: The directory entries of the files, placeholders excluded.
+        """
+        if not os.path.isdir(target_dir):
+            return
+
+        dir_paths = [target_dir]
+        while dir_paths:
+            with os.scandir(dir_paths.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        dir_paths.append(entry.path)
+                    elif entry.name != ".gitkeep" and entry.is_file():
+                        yield entry
+
+    @staticmethod
+    def _zip_file(target_dir: str, sink: BinaryIO) -> None:
+        """
+        Compresses a directory into a zip archive.
 
         Args:
             target_dir (str): The directory to be zipped.
-            zip_path (str): Path to the output zip file.
+            sink (BinaryIO): The file-like object the zip archive is written to.
 
         Returns:
             None
         """
-        zip_instance = zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED)
-
-        for path, _, filenames in os.walk(target_dir):
-            relevant_path = path.replace(target_dir, "")
-            for filename in filenames:
-                if ".gitkeep" in filename or ".zip" in filename:
-                    continue
+        # favour speed over ratio, the archives are mostly html and logs sent once
+        with zipfile.ZipFile(
+            sink, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+        ) as zip_instance:
+            for entry in EmailNotification._scan_files(target_dir):
+                compress_type = (
+                    zipfile.ZIP_STORED
+                    if entry.name.lower().endswith(incompressible_suffixes)
+                    else zipfile.ZIP_DEFLATED
+                )
                 zip_instance.write(
-                    os.path.abspath(os.path.join(path, filename)),
-                    os.path.abspath(os.path.join(relevant_path, filename)),
+                    entry.path,
+                    os.path.relpath(entry.path, target_dir),
+                    compress_type=compress_type,
                 )
 
-        zip_instance.close()
+    def _get_archive(self, target_dir: str) -> bytes:
+        """
+        Get the zip archive of a directory, reusing the last one if no file has changed since.
+
+        Args:
+            target_dir (str): The directory to be zipped.
+
+        Returns:
+            bytes: The content of the zip archive.
+        """
+        # any renamed, resized or rewritten file changes the signature, even with an older mtime
+        signature = frozenset(
+            (os.path.relpath(entry.path, target_dir), stat.st_size, stat.st_mtime_ns)
+            for entry in EmailNotification._scan_files(target_dir)
+            for stat in (entry.stat(),)
+        )
+
+        cached = self._archives.get(target_dir)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        sink = io.BytesIO()
+        EmailNotification._zip_file(target_dir, sink)
+        archive = sink.getvalue()
+        self._archives[target_dir] = (signature, archive)
+
+        return archive
 
     @staticmethod
     def _add_attachment(
-        msg: MIMEMultipart, target_dir: str, max_size_mb: int = 20
+        msg: MIMEMultipart, payload: bytes, filename: str, max_size_mb: int = 20
     ) -> MIMEMultipart:
         """
-        Add attachments from a directory to an email message.
+        Add an attachment to an email message.
 
         Args:
             msg (MIMEMultipart): Email message to which attachments will be added.
-            target_dir (str): The directory containing the attachments.
+            payload (bytes): The content of the attachment.
+            filename (str): The file name of the attachment.
             max_size_mb (int): The max size of attachment (unit - MB). Defaults to 20.
 
         Returns:
             MIMEMultipart: Updated email message with attachments added.
         """
-        if not os.path.exists(target_dir):
-            return msg
-
-        if os.path.getsize(target_dir) / (1024 * 1024) > max_size_mb:
-            logger.warning(f"attachment {target_dir} is larger than {max_size_mb}MB")
+        if len(payload) / (1024 * 1024) > max_size_mb:
+            logger.warning(f"attachment {filename} is larger than {max_size_mb}MB")
             return msg
 
-        filename = os.path.basename(target_dir)
-        f = MIMEApplication(open(target_dir, "rb").read())
-        f.add_header("Content-Disposition", "attachment", filename=filename)
-        msg.attach(f)
+        part = MIMEApplication(payload)
+        part.add_header("Content-Disposition", "attachment", filename=filename)
+        msg.attach(part)
 
         return msg
 
@@ -94,44 +241,28 @@ class EmailNotification:
         """
 
         msg = MIMEMultipart()
-        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        now = datetime.now().isoformat(sep=" ", timespec="seconds")
         subject = f"Test finished at {now}"
         msg["Subject"] = subject
         msg["From"] = self._sender
         msg["To"] = self._recipients
 
-        report_zip_path = os.path.abspath(os.path.join(report_dir, "report.zip"))
-        EmailNotification._zip_file(report_dir, report_zip_path)
-        msg = EmailNotification._add_attachment(msg, report_zip_path)
-
-        log_zip_path = os.path.abspath(os.path.join(log_dir, "log.zip"))
-        EmailNotification._zip_file(log_dir, log_zip_path)
-        msg = EmailNotification._add_attachment(msg, log_zip_path)
-
-        for filename in os.listdir(log_summary_dir):
-            if filename == "summary.log":
-                log_summary_path = os.path.abspath(
-                    os.path.join(log_summary_dir, "summary.log")
-                )
-                if not os.path.exists(log_summary_path):
-                    logger.error(f"file not found: {log_summary_path}")
-                    break
+        # build the archives in memory and attach them without a round trip through disk,
+        # zlib releases the GIL, so both archives are compressed at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            report_zip, log_zip = executor.map(self._get_archive, (report_dir, log_dir))
 
-                with open(log_summary_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
+        msg = EmailNotification._add_attachment(msg, report_zip, "report.zip")
+        msg = EmailNotification._add_attachment(msg, log_zip, "log.zip")
 
-                for line in lines:
-                    msg.attach(MIMEText(line, "plain", _charset="utf-8"))
+        log_summary_path = os.path.abspath(os.path.join(log_summary_dir, "summary.log"))
+        if os.path.exists(log_summary_path):
+            with open(log_summary_path, "r", encoding="utf-8") as f:
+                msg.attach(MIMEText(f.read(), "plain", _charset="utf-8"))
 
-        smtp = None
-        try:
-            smtp = smtplib.SMTP(self._server, 587)
-            smtp.starttls()
-            smtp.login(self._sender, self._password)
-            smtp.send_message(msg)
-        finally:
-            if smtp:
-                smtp.quit()
+        with self._smtp_lock:
+            self._get_smtp().send_message(msg)
+            self._sent_count += 1
 
 
 def send_email():
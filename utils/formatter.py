@@ -1,13 +1,57 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import os
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
 
 import black
 import isort
 
-from utils.dirs import project_dir
+from utils.common import dump_json, load_json
+from utils.dirs import project_dir, tmp_dir
 from utils.logger import logger
 
+black_mode = black.FileMode()
+isort_config = isort.Config(
+    profile="black",
+    known_first_party=["api", "page", "config", "testcases", "utils"],
+)
+# cached digests are only valid for the formatter versions that produced them
+formatter_version = f"black {black.__version__}, isort {isort.__version__}"
+format_cache_path = os.path.join(tmp_dir, "format_cache.json")
+
+
+def _format_one(file_path: str, cached_digest: str = None) -> Tuple[str, str, bool]:
+    """
+    Format a Python file in place.
+
+    Args:
+        file_path (str): The path of the Python file.
+        cached_digest (str): The SHA-256 digest of the file when it was last formatted. Defaults to None.
+
+    Returns:
+        Tuple[str, str, bool]: The path, the SHA-256 digest of the formatted content and whether the file was rewritten.
+    """
+    with open(file_path, "rb") as f:
+        raw_bytes = f.read()
+
+    if hashlib.sha256(raw_bytes).hexdigest() == cached_digest:
+        return file_path, cached_digest, False
+
+    raw_code = raw_bytes.decode("utf-8")
+    formatted_code = black.format_str(raw_code, mode=black_mode)
+    formatted_code = isort.code(formatted_code, config=isort_config)
+    formatted_bytes = formatted_code.encode("utf-8")
+
+    # leave already formatted files untouched so their mtime is kept
+    changed = formatted_bytes != raw_bytes
+    if changed:
+        with open(file_path, "wb") as f:
+            f.write(formatted_bytes)
+
+    return file_path, hashlib.sha256(formatted_bytes).hexdigest(), changed
+
 
 def format_python_files(target_dir: str) -> None:
     """
@@ -19,35 +63,38 @@ def format_python_files(target_dir: str) -> None:
     Returns:
         None
     """
+    file_paths = []
     for root, dirs, files in os.walk(target_dir):
         if "venv" in root:
             continue
         for file in files:
             file_path = os.path.abspath(os.path.join(root, file))
             if file_path.endswith(".py"):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    raw_code = f.read()
-
-                formatted_code = black.format_str(raw_code, mode=black.FileMode())
-                formatted_code = isort.code(
-                    formatted_code,
-                    config=isort.Config(
-                        profile="black",
-                        known_first_party=[
-                            "api",
-                            "page",
-                            "config",
-                            "testcases",
-                            "utils",
-                        ],
-                    ),
-                )
-
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(formatted_code)
+                file_paths.append(file_path)
+
+    cache = {}
+    if os.path.exists(format_cache_path):
+        cache = load_json(format_cache_path)
+    if cache.get("version") != formatter_version:
+        cache = {"version": formatter_version, "digests": {}}
+    digests = cache["digests"]
 
+    # black and isort are pure Python and hold the GIL, so files are formatted in processes,
+    # the results are logged here to keep the workers off the shared log file
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for file_path, digest, changed in executor.map(
+            _format_one,
+            file_paths,
+            [digests.get(file_path) for file_path in file_paths],
+            chunksize=8,
+        ):
+            digests[file_path] = digest
+            if changed:
                 logger.info(f"formatted: {file_path}")
 
+    os.makedirs(tmp_dir, exist_ok=True)
+    dump_json(format_cache_path, cache)
+
 
 if __name__ == "__main__":
     try:
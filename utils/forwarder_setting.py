@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 import getpass
 import os
+import re
+import shlex
 import sys
 import traceback
 
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+# allow running this file directly as a script, the project imports below rely on it
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.common import execute_local_command, get_env_conf
+from utils.logger import logger
 
 
 class ForwarderSetting:
@@ -36,23 +42,19 @@ class ForwarderSetting:
         Returns:
             str: The SSH command with port forwarding.
         """
-        forwards = []
+        command_list = ["ssh"]
         for server in self._servers_list:
-            ip = server.get("ip")
-            port = server.get("port")
+            endpoint = f"""{server["ip"]}:{server["port"]}"""
             if self._use_loopback:
-                forwards += ["-L", f"{ip}:{port}:{ip}:{port}"]
+                command_list.extend(("-L", f"{endpoint}:{endpoint}"))
             else:
-                forwards += ["-L", f"{port}:{ip}:{port}"]
-
-        command_list = (
-            ["ssh"]
-            + forwards
-            + [
+                command_list.extend(("-L", f"""{server["port"]}:{endpoint}"""))
+        command_list.extend(
+            (
                 "-N",
                 "-f",
                 f"""{self._ssh_conf.get("ssh_user")}@{self._ssh_conf.get("ssh_host")}""",
-            ]
+            )
         )
 
         return " ".join(command_list)
@@ -68,16 +70,13 @@ class ForwarderSetting:
         Returns:
             list: The list of process IDs (PIDs) of the matching processes.
         """
-        grep_cmd = f"""ps aux | grep "{command}" """
-        stdout = execute_local_command(grep_cmd)
+        # list only pid and full command line without a shell or grep, the header is suppressed by "="
+        stdout = execute_local_command(["ps", "-eo", "pid=,args="])
 
-        pids = []
-        lines = stdout.strip().split("\n")
-        for line in lines:
-            if command in line and "grep" not in line:
-                pids.append(line.split()[1])
+        # one pass over the whole output, capturing the pid of lines whose command matches exactly
+        pid_pattern = re.compile(rf"^\s*(\d+)\s+{re.escape(command)}\s*$", re.M)
 
-        return pids
+        return pid_pattern.findall(stdout)
 
     def _disconnect_ssh_tunnel(self) -> None:
         """
@@ -111,35 +110,48 @@ class ForwarderSetting:
         else:
             logger.warning(f"""existed for {command}""")
 
-    def _remove_local_interfaces(self) -> None:
+    def _set_local_interfaces(self, add: bool) -> None:
         """
-        Remove local network interfaces/aliases for the specified servers.
+        Add or remove local network interfaces/aliases for the specified servers.
+
+        Args:
+            add (bool): Add the interfaces/aliases if True, otherwise remove them.
 
         Returns:
             None
         """
+        if sys.platform == "darwin":
+            action = "alias" if add else "-alias"
+            commands = [
+                f"ifconfig lo0 {action} {shlex.quote(server.get('ip'))}"
+                for server in self._servers_list
+            ]
+        elif sys.platform == "linux":
+            action = "add" if add else "del"
+            commands = [
+                f"ip addr {action} {shlex.quote(server.get('ip') + '/32')} dev lo"
+                for server in self._servers_list
+            ]
+        else:
+            logger.error("only support macOS and Linux")
+            sys.exit(1)
+
         password = getpass.getpass(
             "please enter sudo password (possible plaintext display): "
         )
-        for server in self._servers_list:
-            if sys.platform == "darwin":
-                command_list = ["sudo", "ifconfig", "lo0", "-alias", server.get("ip")]
-            elif sys.platform == "linux":
-                command_list = [
-                    "sudo",
-                    "ip",
-                    "addr",
-                    "del",
-                    server.get("ip") + "/32",
-                    "dev",
-                    "lo",
-                ]
-            else:
-                logger.error("only support macOS and Linux")
-                sys.exit(1)
+        # a single sudo for all servers, ";" keeps going when an alias already exists or is gone
+        execute_local_command(
+            ["sudo", "-S", "sh", "-c", "; ".join(commands)], inp=password
+        )
 
-            command = " ".join(["sudo", "-S"] + command_list)
-            execute_local_command(command, inp=password)
+    def _remove_local_interfaces(self) -> None:
+        """
+        Remove local network interfaces/aliases for the specified servers.
+
+        Returns:
+            None
+        """
+        self._set_local_interfaces(add=False)
 
     def _add_local_interfaces(self) -> None:
         """
@@ -148,28 +160,7 @@ class ForwarderSetting:
         Returns:
             None
         """
-        password = getpass.getpass(
-            "please enter sudo password (possible plaintext display): "
-        )
-        for server in self._servers_list:
-            if sys.platform == "darwin":
-                command_list = ["sudo", "ifconfig", "lo0", "alias", server.get("ip")]
-            elif sys.platform == "linux":
-                command_list = [
-                    "sudo",
-                    "ip",
-                    "addr",
-                    "add",
-                    server.get("ip") + "/32",
-                    "dev",
-                    "lo",
-                ]
-            else:
-                logger.error("only support macOS and Linux")
-                sys.exit(1)
-
-            command = " ".join(["sudo", "-S"] + command_list)
-            execute_local_command(command, inp=password)
+        self._set_local_interfaces(add=True)
 
     def deactivate_forwarder(self) -> None:
         """
@@ -195,9 +186,6 @@ class ForwarderSetting:
 
 
 if __name__ == "__main__":
-    from utils.common import execute_local_command, get_env_conf
-    from utils.logger import logger
-
     try:
         ForwarderSetting().activate_forwarder()
     except Exception as e:
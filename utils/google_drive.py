@@ -1,21 +1,24 @@
 # -*- coding: utf-8 -*-
+import contextlib
 import os
 import sys
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from types import TracebackType
+from typing import Dict, List
 
-import filelock
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.discovery import Resource, build
 from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
 
-from utils.common import get_ext_conf
-from utils.dirs import config_dir, lock_dir, tmp_dir
+from utils.common import get_ext_conf, get_service_account_credentials
+from utils.dirs import tmp_dir
 from utils.logger import logger
 
 
 class GoogleDrive:
     _instance = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs) -> None:
         """
@@ -25,7 +28,9 @@ class GoogleDrive:
             None
         """
         if not cls._instance:
-            cls._instance = super().__new__(cls)
+            with cls._instance_lock:
+                if not cls._instance:
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self, conf_name: str = "google_api") -> None:
@@ -38,12 +43,18 @@ class GoogleDrive:
         Returns:
             None
         """
-        self._lock = filelock.FileLock(
-            os.path.abspath(os.path.join(lock_dir, "google_drive.lock"))
-        )
-        self._conf = get_ext_conf(name=conf_name)
-        self._drive_service = None
-        self._init()
+        with self._instance_lock:
+            if getattr(self, "_initialized", False):
+                return
+
+            self._conf = get_ext_conf(name=conf_name)
+            self._credentials = None
+            self._local = threading.local()
+            self._ids = {}
+            self._name_locks = {}
+            self._name_locks_guard = threading.Lock()
+            self._init()
+            self._initialized = True
 
     def __enter__(self) -> "GoogleDrive":
         """
@@ -73,27 +84,47 @@ class GoogleDrive:
 
     def _init(self) -> None:
         """
-        Initialize the drive_service.
+        Initialize the credentials of the drive_service.
 
         Returns:
             None
         """
-        cred_service_account_path = os.path.abspath(
-            os.path.join(config_dir, "cred_service_account.json")
-        )
-        credentials = service_account.Credentials.from_service_account_file(
-            filename=cred_service_account_path
-            if not os.environ.get("KEY")
-            else f"{cred_service_account_path}.decrypted",
+        self._credentials = get_service_account_credentials(
             scopes=[
                 "https://www.googleapis.com/auth/drive",
                 "https://www.googleapis.com/auth/drive.metadata",
-            ],
-        )
-        self._drive_service = build(
-            serviceName="drive", version="v3", credentials=credentials
+            ]
         )
 
+    def _get_drive_service(self) -> Resource:
+        """
+        Get the drive_service of the current thread, the http connection under a service is not thread-safe.
+
+        Returns:
+            Resource: The drive_service of the current thread.
+        """
+        drive_service = getattr(self._local, "drive_service", None)
+        if drive_service is None:
+            drive_service = build(
+                serviceName="drive", version="v3", credentials=self._credentials
+            )
+            self._local.drive_service = drive_service
+
+        return drive_service
+
+    def _get_name_lock(self, name: str) -> threading.Lock:
+        """
+        Get the lock of a folder/file name, so only operations on the same name wait for each other.
+
+        Args:
+            name (str): The name of the folder/file.
+
+        Returns:
+            threading.Lock: The lock of the name.
+        """
+        with self._name_locks_guard:
+            return self._name_locks.setdefault(name, threading.Lock())
+
     def _create_folder(self, folder_name: str, parent_folder_id: str = None) -> str:
         """
         Create a new folder in Google Drive.
@@ -112,12 +143,14 @@ class GoogleDrive:
         }
 
         response = (
-            self._drive_service.files()
+            self._get_drive_service()
+            .files()
             .create(body=file_metadata, fields="id")
             .execute()
         )
         folder_id = response.get("id")
         if folder_id is not None:
+            self._ids[folder_name] = folder_id
             logger.info(f"created folder {folder_name}")
         else:
             logger.warning(
@@ -135,7 +168,14 @@ class GoogleDrive:
         Returns:
             str: The ID of the folder/file if found, otherwise empty string.
         """
-        response = self._drive_service.files().list(q=f""" name="{name}" """).execute()
+        # ids of found names are kept until deleted, so repeated lookups skip the list request
+        result_id = self._ids.get(name)
+        if result_id:
+            return result_id
+
+        response = (
+            self._get_drive_service().files().list(q=f""" name="{name}" """).execute()
+        )
 
         files = response.get("files", [])
         if files:
@@ -143,12 +183,67 @@ class GoogleDrive:
                 logger.error(f"too many results for name: {name}")
                 sys.exit(1)
             result_id = files[0].get("id")
+            self._ids[name] = result_id
         else:
             logger.warning(f"no search result for name {name}")
             result_id = ""
 
         return result_id
 
+    def _get_ids(self, names: List[str]) -> Dict[str, str]:
+        """
+        Get the IDs of folders/files by their names, looking up many names per request.
+
+        Args:
+            names (List[str]): The names of the folders/files to search for.
+
+        Returns:
+            Dict[str, str]: The ID of each name if found, otherwise empty string.
+        """
+        result_ids = {name: self._ids[name] for name in names if self._ids.get(name)}
+        missing_names = [
+            name for name in dict.fromkeys(names) if name not in result_ids
+        ]
+
+        found_ids = {}
+        # 50 names per query keeps the request url well below its length limit
+        for start in range(0, len(missing_names), 50):
+            query = " or ".join(
+                f"""name="{name}" """ for name in missing_names[start : start + 50]
+            )
+            page_token = None
+            while True:
+                response = (
+                    self._get_drive_service()
+                    .files()
+                    .list(
+                        q=query,
+                        fields="nextPageToken, files(id, name)",
+                        pageSize=1000,
+                        pageToken=page_token,
+                    )
+                    .execute()
+                )
+                for file in response.get("files", []):
+                    found_ids.setdefault(file.get("name"), []).append(file.get("id"))
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    break
+
+        for name in missing_names:
+            file_ids = found_ids.get(name, [])
+            if len(file_ids) > 1:
+                logger.error(f"too many results for name: {name}")
+                sys.exit(1)
+            elif file_ids:
+                result_ids[name] = file_ids[0]
+                self._ids[name] = file_ids[0]
+            else:
+                logger.warning(f"no search result for name {name}")
+                result_ids[name] = ""
+
+        return result_ids
+
     def upload_file(self, file_path: str, file_name: str = None) -> bool:
         """
         Upload a file to Google Drive.
@@ -169,19 +264,29 @@ class GoogleDrive:
         if not folder_name:
             folder_name = "tmp"
 
-        folder_id = self._get_id(name=folder_name)
-        if not folder_id:
-            folder_id = self._create_folder(folder_name=folder_name)
+        # concurrent uploads must not each create the missing folder
+        with self._get_name_lock(folder_name):
+            folder_id = self._get_id(name=folder_name)
+            if not folder_id:
+                folder_id = self._create_folder(folder_name=folder_name)
 
         file_metadata.update({"parents": [folder_id]})
 
-        media = MediaFileUpload(file_path)
-        with self._lock:
-            response = (
-                self._drive_service.files()
+        # resumable chunks are retried on their own instead of restarting the whole upload
+        media = MediaFileUpload(file_path, chunksize=8 * 1024 * 1024, resumable=True)
+        with self._get_name_lock(file_name):
+            request = (
+                self._get_drive_service()
+                .files()
                 .create(body=file_metadata, media_body=media, fields="id")
-                .execute()
             )
+            response = None
+            logged_decile = -1
+            while response is None:
+                status, response = request.next_chunk(num_retries=5)
+                if status and int(status.progress() * 10) != logged_decile:
+                    logged_decile = int(status.progress() * 10)
+                    logger.info(f"progress: {int(status.progress() * 100)}%")
 
         if response.get("id") is not None:
             logger.info(
@@ -192,6 +297,20 @@ class GoogleDrive:
             logger.error(f"failed to upload, response: {response}")
             return False
 
+    def upload_files(self, file_paths: List[str], max_workers: int = 4) -> List[bool]:
+        """
+        Upload files to Google Drive concurrently.
+
+        Args:
+            file_paths (List[str]): Paths to the files to upload.
+            max_workers (int): The max number of concurrent uploads. Defaults to 4.
+
+        Returns:
+            List[bool]: Whether each file was uploaded successfully, in the order of file_paths.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.upload_file, file_paths))
+
     def download_file(self, file_name: str, destination_path: str = None) -> bool:
         """
         Download a file from Google Drive.
@@ -207,17 +326,22 @@ class GoogleDrive:
         if not file_id:
             return False
 
-        response = self._drive_service.files().get_media(fileId=file_id)
+        response = self._get_drive_service().files().get_media(fileId=file_id)
 
         if destination_path is None:
             destination_path = os.path.abspath(os.path.join(tmp_dir, file_name))
 
         with open(destination_path, "wb") as file:
-            downloader = MediaIoBaseDownload(file, response)
+            # large chunks keep big downloads bandwidth bound, progress is logged every 10%
+            downloader = MediaIoBaseDownload(file, response, chunksize=16 * 1024 * 1024)
             done = False
+            logged_decile = -1
             while not done:
                 status, done = downloader.next_chunk()
-                logger.info(f"progress: {int(status.progress() * 100)}%")
+                decile = int(status.progress() * 10)
+                if decile != logged_decile:
+                    logged_decile = decile
+                    logger.info(f"progress: {int(status.progress() * 100)}%")
 
         logger.info(f"downloaded file {file_name} to {destination_path}")
         return True
@@ -232,16 +356,61 @@ class GoogleDrive:
         Returns:
             bool: True if the file was deleted successfully, False otherwise.
         """
-        file_id = self._get_id(name=file_name)
-        if not file_id:
-            return False
+        with self._get_name_lock(file_name):
+            file_id = self._get_id(name=file_name)
+            if not file_id:
+                return False
 
-        with self._lock:
-            self._drive_service.files().delete(fileId=file_id).execute()
+            self._get_drive_service().files().delete(fileId=file_id).execute()
+            self._ids.pop(file_name, None)
 
         logger.info(f"deleted file {file_name} from Google Drive")
         return True
 
+    def delete_files(self, file_names: List[str]) -> List[bool]:
+        """
+        Delete files from Google Drive, sending the delete requests in batches.
+
+        Args:
+            file_names (List[str]): The names of the files to delete.
+
+        Returns:
+            List[bool]: Whether each file was deleted successfully, in the order of file_names.
+        """
+        deleted = dict.fromkeys(file_names, False)
+
+        def callback(request_id: str, response: dict, exception: Exception) -> None:
+            if exception is None:
+                deleted[request_id] = True
+                self._ids.pop(request_id, None)
+                logger.info(f"deleted file {request_id} from Google Drive")
+            else:
+                logger.error(f"failed to delete {request_id}: {exception}")
+
+        with contextlib.ExitStack() as stack:
+            # locks are taken in a fixed order so that two batches cannot deadlock
+            for file_name in sorted(deleted):
+                stack.enter_context(self._get_name_lock(file_name))
+
+            file_ids = [
+                (file_name, file_id)
+                for file_name, file_id in self._get_ids(names=list(deleted)).items()
+                if file_id
+            ]
+
+            drive_service = self._get_drive_service()
+            # a batch request carries at most 100 calls
+            for start in range(0, len(file_ids), 100):
+                batch = drive_service.new_batch_http_request(callback=callback)
+                for file_name, file_id in file_ids[start : start + 100]:
+                    batch.add(
+                        drive_service.files().delete(fileId=file_id),
+                        request_id=file_name,
+                    )
+                batch.execute()
+
+        return [deleted[file_name] for file_name in file_names]
+
 
 if __name__ == "__main__":
     try:
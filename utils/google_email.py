@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
-import base64
+import io
 import os
+import threading
 import traceback
 from email import encoders
 from email.mime.base import MIMEBase
@@ -13,6 +14,7 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.http import MediaIoBaseUpload
 
 from utils.common import get_ext_conf
 from utils.dirs import config_dir, lock_dir, tmp_dir
@@ -21,6 +23,7 @@ from utils.logger import logger
 
 class GoogleEmail:
     _instance = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs) -> None:
         """
@@ -30,7 +33,9 @@ class GoogleEmail:
             None
         """
         if not cls._instance:
-            cls._instance = super().__new__(cls)
+            with cls._instance_lock:
+                if not cls._instance:
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self, conf_name: str = "google_api") -> None:
@@ -43,12 +48,17 @@ class GoogleEmail:
         Returns:
             None
         """
-        self._lock = filelock.FileLock(
-            os.path.abspath(os.path.join(lock_dir, "google_email.lock"))
-        )
-        self._conf = get_ext_conf(name=conf_name)
-        self._gmail_service = None
-        self._init()
+        with self._instance_lock:
+            if getattr(self, "_initialized", False):
+                return
+
+            self._lock = filelock.FileLock(
+                os.path.abspath(os.path.join(lock_dir, "google_email.lock"))
+            )
+            self._conf = get_ext_conf(name=conf_name)
+            self._gmail_service = None
+            self._init()
+            self._initialized = True
 
     def __enter__(self) -> "GoogleEmail":
         """
@@ -171,13 +181,21 @@ class GoogleEmail:
             )
             message.attach(attachment)
 
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
-        response = (
+        # upload the message as rfc822 media instead of a base64url encoded copy in the json body
+        media = MediaIoBaseUpload(
+            io.BytesIO(message.as_bytes()),
+            mimetype="message/rfc822",
+            chunksize=8 * 1024 * 1024,
+            resumable=True,
+        )
+        request = (
             self._gmail_service.users()
             .messages()
-            .send(userId="me", body={"raw": raw_message})
-            .execute()
+            .send(userId="me", body={}, media_body=media)
         )
+        response = None
+        while response is None:
+            _, response = request.next_chunk(num_retries=5)
         logger.info(f"email sent successfully! response: {response}")
 
 
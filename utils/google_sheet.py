@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
 import sys
+import threading
 import traceback
 from types import TracebackType
 from typing import List
@@ -8,24 +9,30 @@ from typing import List
 import filelock as filelock
 import gspread
 
-from utils.common import get_ext_conf
-from utils.dirs import config_dir, lock_dir
+from utils.common import get_ext_conf, get_service_account_credentials
+from utils.dirs import lock_dir
 from utils.logger import logger
 
 
 class GoogleSheet:
-    _instance = None
+    _instances = {}
+    _instance_lock = threading.Lock()
 
-    def __new__(cls, *args, **kwargs) -> None:
+    def __new__(cls, conf_name: str = "google_api") -> None:
         """
-        Implement singleton mode.
+        Implement singleton mode, one instance per configuration.
+
+        Args:
+            conf_name (str): The name of the configuration. Defaults to "google_api".
 
         Returns:
             None
         """
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        if conf_name not in cls._instances:
+            with cls._instance_lock:
+                if conf_name not in cls._instances:
+                    cls._instances[conf_name] = super().__new__(cls)
+        return cls._instances[conf_name]
 
     def __init__(self, conf_name: str = "google_api") -> None:
         """
@@ -37,14 +44,19 @@ class GoogleSheet:
         Returns:
             None
         """
-        self._lock = filelock.FileLock(
-            os.path.abspath(os.path.join(lock_dir, "google_sheet.lock"))
-        )
-        self._conf = get_ext_conf(name=conf_name)
-        self._gspread_client = None
-        self._sheet_page = None
-        self._active_sheet = None
-        self._init()
+        with self._instance_lock:
+            if getattr(self, "_initialized", False):
+                return
+
+            self._lock = filelock.FileLock(
+                os.path.abspath(os.path.join(lock_dir, "google_sheet.lock"))
+            )
+            self._conf = get_ext_conf(name=conf_name)
+            self._gspread_client = None
+            self._sheet_page = None
+            self._active_sheet = None
+            self._init()
+            self._initialized = True
 
     def __enter__(self) -> "GoogleSheet":
         """
@@ -79,17 +91,13 @@ class GoogleSheet:
         Returns:
             None
         """
-        cred_service_account_path = os.path.abspath(
-            os.path.join(config_dir, "cred_service_account.json")
-        )
-        self._gspread_client = gspread.service_account(
-            filename=cred_service_account_path
-            if not os.environ.get("KEY")
-            else f"{cred_service_account_path}.decrypted",
-            scopes=[
-                "https://www.googleapis.com/auth/drive",
-                "https://www.googleapis.com/auth/spreadsheets",
-            ],
+        self._gspread_client = gspread.authorize(
+            get_service_account_credentials(
+                scopes=[
+                    "https://www.googleapis.com/auth/drive",
+                    "https://www.googleapis.com/auth/spreadsheets",
+                ]
+            )
         )
         self._sheet_page = self._gspread_client.open(
             self._conf.get("google_sheet").get("file_name")
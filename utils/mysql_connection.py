@@ -2,17 +2,19 @@
 import os
 import traceback
 from types import TracebackType
-from typing import Dict, List, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 
 import filelock
 import pymysql
 from pymysql import Connection, cursors
-from sshtunnel import SSHTunnelForwarder
 
 from utils.common import get_env_conf
 from utils.dirs import lock_dir
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    from sshtunnel import SSHTunnelForwarder
+
 pymysql.install_as_MySQLdb()
 
 
@@ -87,7 +89,7 @@ class MysqlConnection:
     @staticmethod
     def _create_mysql_connection(
         mysql_conf: dict, ssh_conf: dict, use_tunnel: bool
-    ) -> Union[Tuple[None, Connection], Tuple[SSHTunnelForwarder, Connection]]:
+    ) -> Union[Tuple[None, Connection], Tuple["SSHTunnelForwarder", Connection]]:
         """
         Create a MySQL connection.
 
@@ -101,6 +103,8 @@ class MysqlConnection:
             and MySQL connection objects if using tunnel, otherwise None and MySQL connection object.
         """
         if use_tunnel:
+            from sshtunnel import SSHTunnelForwarder
+
             tunnel_forwarder = SSHTunnelForwarder(
                 ssh_address=(ssh_conf["ssh_host"], ssh_conf["ssh_port"]),
                 ssh_username=ssh_conf["ssh_user"],
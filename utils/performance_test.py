@@ -92,8 +92,7 @@ def main():
     ]
 
     logger.info(f"{locust_bin_dir} running...")
-    command = " ".join(locust_command)
-    execute_local_command(command)
+    execute_local_command(locust_command)
 
 
 if __name__ == "__main__":
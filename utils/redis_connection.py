@@ -2,16 +2,18 @@
 import os
 import traceback
 from types import TracebackType
-from typing import Tuple, Union
+from typing import TYPE_CHECKING, Tuple, Union
 
 import filelock
 from redis import StrictRedis
-from sshtunnel import SSHTunnelForwarder
 
 from utils.common import get_env_conf
 from utils.dirs import lock_dir
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    from sshtunnel import SSHTunnelForwarder
+
 
 class RedisConnection:
     _instance = None
@@ -84,7 +86,7 @@ class RedisConnection:
     @staticmethod
     def _create_redis_connection(
         redis_conf: dict, ssh_conf: dict, use_tunnel: bool
-    ) -> Union[Tuple[None, StrictRedis], Tuple[SSHTunnelForwarder, StrictRedis]]:
+    ) -> Union[Tuple[None, StrictRedis], Tuple["SSHTunnelForwarder", StrictRedis]]:
         """
         Create a Redis connection.
 
@@ -98,6 +100,8 @@ class RedisConnection:
             and Redis connection objects if using tunnel, otherwise None and Redis connection object.
         """
         if use_tunnel:
+            from sshtunnel import SSHTunnelForwarder
+
             tunnel_forwarder = SSHTunnelForwarder(
                 ssh_address=(ssh_conf["ssh_host"], ssh_conf["ssh_port"]),
                 ssh_username=ssh_conf["ssh_user"],
@@ -2,7 +2,6 @@
 import os
 import sys
 import traceback
-from datetime import datetime
 
 import requests
 
@@ -51,28 +50,23 @@ class SwaggerDiff:
 
     def _find_old_swagger_json_path(self) -> str:
         """
-        Find the path of the oldest swagger json file.
+        Find the path of the latest history swagger json file.
 
         Returns:
-            str: The absolute path of the oldest swagger json file, or an empty string if no json file is found.
+            str: The absolute path of the latest history swagger json file, or an empty string if no json file is found.
         """
-        json_list = []
         os.makedirs(self._history_swagger_dir, exist_ok=True)
-        for filename in os.listdir(self._history_swagger_dir):
-            if filename.endswith(".json"):
-                date_string = filename.split(".")[0]
-                timestamp = datetime.strptime(date_string, "%Y%m%d_%H%M%S").timestamp()
-                json_list.append({"datetime": date_string, "timestamp": timestamp})
+        json_names = [
+            filename
+            for filename in os.listdir(self._history_swagger_dir)
+            if filename.endswith(".json")
+        ]
 
-        if not json_list:
+        if not json_names:
             return ""
 
-        sorted(json_list, key=lambda x: x["timestamp"])
-        return os.path.abspath(
-            os.path.join(
-                self._history_swagger_dir, f"""{json_list[-1]["datetime"]}.json"""
-            )
-        )
+        # names are formatted as "%Y%m%d_%H%M%S", so the lexicographic maximum is the latest
+        return os.path.abspath(os.path.join(self._history_swagger_dir, max(json_names)))
 
     def _load_old_swagger_json(self) -> dict:
         """
@@ -155,7 +149,7 @@ class SwaggerDiff:
                 os.path.join(self._swagger_diff_dir, f"{get_current_datetime()}.json")
             )
             logger.info(f"swagger changed")
-            dump_json(swagger_diff_path, result)
+            dump_json(swagger_diff_path, result, indent=True)
 
             dump_json(self._new_json_path, self._current_swagger_json)
 
@@ -16,6 +16,18 @@ from config.conf import Global
 from utils.dirs import template_dir
 from utils.logger import logger
 
+builtin_names = frozenset(dir(builtins))
+python_type_mapping = {
+    "string": "str",
+    "integer": "int",
+    "int": "int",
+    "long": "int",
+    "boolean": "bool",
+    "array": "list",
+    "list": "list",
+    "object": "dict",
+}
+
 
 class SwaggerParser:
     def __init__(self, swagger_url: str) -> None:
@@ -184,7 +196,7 @@ class SwaggerParser:
         Returns:
             str: The modified name.
         """
-        if keyword.iskeyword(name) or name in dir(builtins):
+        if keyword.iskeyword(name) or name in builtin_names:
             name = f"param_{name}"
         return name
 
@@ -199,16 +211,6 @@ class SwaggerParser:
         Returns:
             str: Python type.
         """
-        python_type_mapping = {
-            "string": "str",
-            "integer": "int",
-            "int": "int",
-            "long": "int",
-            "boolean": "bool",
-            "array": "list",
-            "list": "list",
-            "object": "dict",
-        }
         return python_type_mapping.get(java_type.lower(), "Any")
 
     def _generate_sample_data(self, schema: dict) -> Union[dict, list, int, str]:
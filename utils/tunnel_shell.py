@@ -1,31 +1,43 @@
 # -*- coding: utf-8 -*-
+import atexit
 import os
+import socket
+import threading
 import traceback
 from types import TracebackType
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
 import filelock
-import paramiko
-from paramiko.channel import ChannelFile, ChannelStderrFile, ChannelStdinFile
 
-from utils.common import get_env_conf
+from utils.common import get_env_conf, get_private_key
+from utils.decorators import NULL_LOCK, is_multiprocess
 from utils.dirs import lock_dir
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    import paramiko
+    from paramiko.channel import ChannelFile, ChannelStderrFile, ChannelStdinFile
+
 
 class TunnelShell:
-    _instance = None
+    _instances = {}
+    _instance_lock = threading.Lock()
 
-    def __new__(cls, *args, **kwargs) -> None:
+    def __new__(cls, conf_name: str = "ssh") -> None:
         """
-        Implement singleton mode.
+        Implement singleton mode, one instance per configuration.
+
+        Args:
+            conf_name (str): The name of the configuration. Defaults to "ssh".
 
         Returns:
             None
         """
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        if conf_name not in cls._instances:
+            with cls._instance_lock:
+                if conf_name not in cls._instances:
+                    cls._instances[conf_name] = super().__new__(cls)
+        return cls._instances[conf_name]
 
     def __init__(self, conf_name: str = "ssh") -> None:
         """
@@ -37,11 +49,18 @@ class TunnelShell:
         Returns:
             None
         """
-        self._lock = filelock.FileLock(
-            os.path.abspath(os.path.join(lock_dir, f"{conf_name}.lock"))
-        )
-        self._conf = get_env_conf(name=conf_name)
-        self._tunnel_client = None
+        with self._instance_lock:
+            if getattr(self, "_initialized", False):
+                return
+
+            self._thread_lock = threading.Lock()
+            self._file_lock = filelock.FileLock(
+                os.path.abspath(os.path.join(lock_dir, f"{conf_name}.lock"))
+            )
+            self._conf = get_env_conf(name=conf_name)
+            self._tunnel_client = None
+            atexit.register(self.close)
+            self._initialized = True
 
     def __enter__(self) -> "TunnelShell":
         """
@@ -72,7 +91,7 @@ class TunnelShell:
         self.close()
 
     @staticmethod
-    def _create_tunnel_client(ssh_conf: dict) -> paramiko.SSHClient:
+    def _create_tunnel_client(ssh_conf: dict) -> "paramiko.SSHClient":
         """
         Create a tunnel client connection.
 
@@ -82,14 +101,11 @@ class TunnelShell:
         Returns:
             paramiko.SSHClient: tunnel client object.
         """
+        import paramiko
+
         tunnel_client = paramiko.SSHClient()
         tunnel_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh_key = ssh_conf.get("ssh_key")
-
-        if ssh_key is None:
-            private_key = None
-        else:
-            private_key = paramiko.RSAKey.from_private_key_file(ssh_conf.get("ssh_key"))
+        private_key = get_private_key(ssh_conf.get("ssh_key"))
 
         tunnel_client.connect(
             hostname=ssh_conf["ssh_host"],
@@ -98,12 +114,28 @@ class TunnelShell:
             pkey=private_key,
             password=ssh_conf.get("ssh_password"),
         )
+        # keep the idle session from being dropped by NAT or firewalls between commands
+        tunnel_client.get_transport().set_keepalive(30)
 
         return tunnel_client
 
+    def _is_connected(self) -> bool:
+        """
+        Check whether the tunnel client transport is still alive.
+
+        Returns:
+            bool: True if the existing connection can be reused, False otherwise.
+        """
+        if self._tunnel_client is None:
+            return False
+
+        transport = self._tunnel_client.get_transport()
+
+        return transport is not None and transport.is_active()
+
     def _execute(
         self, command: str
-    ) -> Tuple[ChannelStdinFile, ChannelFile, ChannelStderrFile]:
+    ) -> Tuple["ChannelStdinFile", "ChannelFile", "ChannelStderrFile"]:
         """
         Execute a command on the tunnel client.
 
@@ -114,7 +146,8 @@ class TunnelShell:
             Tuple[ChannelStdinFile, ChannelFile, ChannelStderrFile]: A tuple contained the input, output, and error.
         """
         try:
-            if self._tunnel_client is None:
+            if not self._is_connected():
+                self.close()
                 self._tunnel_client = TunnelShell._create_tunnel_client(self._conf)
         except Exception as exception:
             logger.error(f"{exception}\n{traceback.format_exc()}")
@@ -123,25 +156,39 @@ class TunnelShell:
             stdin, stdout, stderr = self._tunnel_client.exec_command(command)
             return stdin, stdout, stderr
 
-    def execute_command(self, command: str) -> ChannelStdinFile:
+    def execute_command(self, command: str, timeout: float = 600) -> "ChannelStdinFile":
         """
         Execute a command and log the output.
 
         Args:
             command (str): The command to execute.
+            timeout (float): Seconds without output before a hung command is abandoned. Defaults to 600.
 
         Returns:
-            ChannelStdinFile: The input channel of the tunnel client.
+            ChannelStdinFile: The input channel of this command, commands share the transport but not channels.
         """
-        with self._lock:
+        # the file lock is only needed when other processes drive the same host
+        with self._thread_lock, self._file_lock if is_multiprocess() else NULL_LOCK:
             stdin, stdout, stderr = self._execute(command)
             logger.info(f"executed command: {command}")
-            output = stdout.read().decode("utf-8").strip()
-            error = stderr.read().decode("utf-8").strip()
-            if output:
-                logger.info(f"""standard output: {output}""")
-            if error:
-                logger.error(f"""standard error: {error}""")
+            stdout.channel.settimeout(timeout)
+            try:
+                # log the output as it arrives instead of holding all of it in memory
+                for line in iter(stdout.readline, ""):
+                    line = line.rstrip()
+                    if line:
+                        logger.info(f"""standard output: {line}""")
+                error = stderr.read().decode("utf-8").strip()
+                if error:
+                    logger.error(f"""standard error: {error}""")
+            except socket.timeout:
+                logger.error(
+                    f"command timed out after {timeout}s without output: {command}"
+                )
+            finally:
+                # release the output buffers, the channel stays open for the returned stdin
+                stdout.close()
+                stderr.close()
             return stdin
 
     def close(self) -> None:
@@ -153,3 +200,4 @@ class TunnelShell:
         """
         if self._tunnel_client:
             self._tunnel_client.close()
+            self._tunnel_client = None